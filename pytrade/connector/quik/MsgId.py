@@ -14,6 +14,8 @@ class MsgId:
     # 22101:"Ответ по снятию стоп-заявки"},
     MSG_ID_AUTH = 20006
     MSG_ID_TRADE_SESSION_OPEN = 20000
+    MSG_ID_PIN_REQUEST = 20001
+    MSG_ID_CONNECTION_STATUS = 20008
     MSG_ID_EXIT = 10006
     MSG_ID_CREATE_DATASOURCE = 11016
     MSG_ID_CREATE_LEVEL2_DATASOURCE = 11014
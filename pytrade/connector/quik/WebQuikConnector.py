@@ -1,11 +1,21 @@
-import json
 import logging
+import socket
 from datetime import datetime
-from enum import Enum
 import websocket
 from websocket import WebSocketApp, ABNF
 from connector.quik.MsgId import MsgId
 
+# orjson parses raw bytes directly and is much faster than stdlib json, use it if installed
+try:
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:
+    import json
+
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 
 class WebQuikConnector:
     """
@@ -15,22 +25,42 @@ class WebQuikConnector:
     ToDo: process quotes 21016 and level2 21014 messages instead of general data 21011
     """
 
-    # Connector possible statuses:
-    class Status(Enum):
+    # Connector possible statuses. Plain int constants, cheaper to compare than Enum members:
+    class Status:
         CONNECTING = 0
         CONNECTED = 1
         BUSY = 2
         DISCONNECTING = 3
         DISCONNECTED = 4
 
+    # Fixed instance attributes, accessed on every message
+    __slots__ = ('_conn', '_sockopt', 'websocket_app', '_passwd', '_account', 'status', '_callbacks',
+                 '_heartbeat_cnt', 'feed', 'broker')
+
     _HEARTBEAT_SECONDS = 3
+    # Outgoing messages and constant message parts, built once
+    _AUTH_MSG_FIELDS = {"width": "200", "height": "200",
+                        "userAgent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                                     "Chrome/44.0.2403.157 Safari/537.36",
+                        "lang": "ru", "sid": "144f9.2b851e74", "version": "6.6.1"}
+    _CONNECTED_MSG = b'{"msgid":10008}'
+    _CLOSE_MSG = b'{"msgid":11016}'
+
+    # Delimiter between class and code in quik asset strings like QJSIM¦SBER
+    ASSET_DELIMITER = "¦"
 
     _logger = logging.getLogger(__name__)
-    _logger.setLevel(logging.DEBUG)
 
-    def __init__(self, conn, account, passwd):
+    def __init__(self, conn, account, passwd, rcvbuf=None, sndbuf=None):
         # Create websocket, do not open and run here
         self._conn = conn
+        # Optional fixed kernel socket buffer sizes. Not set by default: on Linux a fixed SO_RCVBUF turns off
+        # receive buffer autotuning and is capped by net.core.rmem_max.
+        self._sockopt = []
+        if rcvbuf is not None:
+            self._sockopt.append((socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf))
+        if sndbuf is not None:
+            self._sockopt.append((socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf))
         self.websocket_app: WebSocketApp = websocket.WebSocketApp(self._conn,
                                                                   on_message=self._on_message,
                                                                   on_error=self._on_error,
@@ -44,7 +74,9 @@ class WebQuikConnector:
         # Callbacks for different messages msgid
         # Socket callback self._on_message will call these
         self._callbacks = {MsgId.MSG_ID_AUTH: self._on_auth,
-                           MsgId.MSG_ID_TRADE_SESSION_OPEN: self._on_trade_session_open
+                           MsgId.MSG_ID_TRADE_SESSION_OPEN: self._on_trade_session_open,
+                           MsgId.MSG_ID_PIN_REQUEST: self._on_pin_request,
+                           MsgId.MSG_ID_CONNECTION_STATUS: self._on_connection_status
                            }
 
         # Heart beat support
@@ -60,18 +92,16 @@ class WebQuikConnector:
             self.status = WebQuikConnector.Status.CONNECTING
             self._logger.info("Connecting to " + self._conn)
             # Run loop
-            self.websocket_app.run_forever(ping_interval=self._HEARTBEAT_SECONDS)
+            # Json parser validates utf-8 itself, don't make websocket pass through each text frame again
+            self.websocket_app.run_forever(sockopt=self._sockopt, ping_interval=self._HEARTBEAT_SECONDS,
+                                           skip_utf8_validation=True)
 
     def _on_socket_open(self):
         """
         Socket on_open handler
         Login just after web socket has been opened
         """
-        auth_msg = '{"msgid":10000,"login":"' + self._account + '","password":"' + self._passwd \
-                   + '","width":"200","height":"200","userAgent":"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 ' \
-                     '(KHTML, like Gecko) Chrome/44.0.2403.157 Safari/537.36","lang":"ru",' \
-                     '"sid":"144f9.2b851e74","version":"6.6.1"} '
-        self.websocket_app.send(auth_msg)
+        self.send({"msgid": 10000, "login": self._account, "password": self._passwd, **self._AUTH_MSG_FIELDS})
 
     def _on_trade_session_open(self, msg):
         """
@@ -91,6 +121,19 @@ class WebQuikConnector:
             self.close()
             raise ConnectionError('Trade session opening failure: %s' % msg)
 
+    def _on_pin_request(self, msg):
+        """
+        Server requested sms pin code, ask user for it
+        """
+        pin_code = input("Enter sms pin code: ")
+        self.send({"msgid": 10001, "pin": pin_code})
+
+    def _on_connection_status(self, msg):
+        """
+        Connection status request, confirm we are connected
+        """
+        self.websocket_app.send(self._CONNECTED_MSG)
+
     def _on_auth(self, msg):
         """
         Authentication has passed, subscribe the feed and broker.
@@ -106,46 +149,49 @@ class WebQuikConnector:
     def _on_message(self, raw_msg):
         """
         Entry for message processing. Call specific processors for different messages.
+        Websocket client reassembles frames, so raw_msg is always exactly one complete json message.
         """
-        strmsg = raw_msg.decode()
-        self._logger.debug('Got msg %s', strmsg)
-        msg = json.loads(strmsg)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug('Got msg %s', raw_msg.decode(errors='replace'))
+        msg = json_loads(raw_msg)
         # Find and execute callback function for this message
         msgid = msg['msgid']
         callback = self._callbacks.get(msgid)
-        if msgid == 20001:
-            pin_code = input("Enter sms pin code: ")
-            pin_msg = '{"msgid":10001,"pin":"%s"}' % pin_code
-            self.websocket_app.send(pin_msg) 
-        elif msgid == 20008:
-            connected_msg = '{"msgid":10008}'
-            self.websocket_app.send(connected_msg)
-        # Pass message along pipeline
-        elif callback:
+        if callback:
             # Don't send msg to consumers, process it in this class
             callback(msg)
-        elif msgid // 1000 == 21 and self.feed is not None:
+            return
+        # Pass message along pipeline
+        msg_group = msgid // 1000
+        if msg_group == 21 and self.feed is not None:
             # Send to feed
             self.feed.on_message(msg)
-        elif msgid // 1000 == 22 and self.broker is not None:
+        elif msg_group == 22 and self.broker is not None:
             # Send to broker
             self.broker.on_message(msg)
 
+    def send(self, msg: dict, opcode=ABNF.OPCODE_TEXT):
+        """
+        Serialize message to json and send it to server
+        """
+        self.websocket_app.send(json_dumps(msg), opcode=opcode)
+
     @staticmethod
     def asset2tuple(s):
         """
         Converts quik asset string to tuple(class, code)
         """
-        # Split s and return first 2 parts - class and code
-        parts: list = s.split("¦")
-        return tuple([parts[0], parts[1]])
+        # Partition s and return first 2 parts - class and code. The rest, like interval in graph asset, is dropped
+        delimiter = WebQuikConnector.ASSET_DELIMITER
+        asset_class, _, rest = s.partition(delimiter)
+        return asset_class, rest.partition(delimiter)[0]
 
     @staticmethod
     def tuple2asset(t: tuple):
         """
         Converts asset tuple(class, code) to quik compatible string class¦code
         """
-        return "%s¦%s" % (t[0], t[1])
+        return t[0] + WebQuikConnector.ASSET_DELIMITER + t[1]
 
     def _on_error(self, error):
         self._logger.error('Got error msg %s', error)
@@ -157,7 +203,7 @@ class WebQuikConnector:
         if self.status != WebQuikConnector.Status.DISCONNECTING and self.Status != WebQuikConnector.Status.DISCONNECTED:
             self._logger.info("Disconnecting")
             self.status = WebQuikConnector.Status.DISCONNECTING
-            self.websocket_app.send('{"msgid":11016}')
+            self.websocket_app.send(self._CLOSE_MSG)
             self.websocket_app.close()
 
     def _on_close(self):
@@ -2,7 +2,6 @@ from connector.quik.MsgId import MsgId
 import websocket
 from datetime import datetime
 from websocket import WebSocketApp, ABNF
-import json
 import logging
 from connector.quik.WebQuikConnector import WebQuikConnector
 
@@ -12,14 +11,19 @@ class WebQuikFeed:
     Feed facade. Provides feed info from web quik connector to consumer.
     Parse feed messages from web quik.
     """
+    # Fixed instance attributes, accessed on every feed message
+    __slots__ = ('_connector', '_feed_subscribers', '_callbacks')
+
     _logger = logging.getLogger(__name__)
-    _logger.setLevel(logging.DEBUG)
+
+    _LEVEL2_DEPTH = 30
 
     def __init__(self, connector: WebQuikConnector):
         self._connector = connector
         self._connector.feed = self
 
-        # Subscribers for data feed. {(class_code, sec_code): callback_func}
+        # Subscribers for data feed, keyed by quik asset string class¦code like in feed messages.
+        # {asset_str: callback_func}
         self._feed_subscribers = {}
         self._callbacks = {MsgId.MSG_ID_QUOTES: self._on_quotes,
                            MsgId.MSG_ID_GRAPH: self._on_candle,
@@ -37,17 +41,15 @@ class WebQuikFeed:
         """
         # Request quotes
         self._logger.info('Requesting quotes for %s\\%s', class_code, sec_code)
-        msg = '{"msgid":%s,"c":"%s","s":"%s","p":%s}' % (MsgId.MSG_ID_CREATE_DATASOURCE, class_code, sec_code, 0)
-        msg = msg.encode()
-        self._logger.debug('Sending msg: %s' % msg)
-        self._connector.websocket_app.send(msg)
+        quotes_msg = {"msgid": MsgId.MSG_ID_CREATE_DATASOURCE, "c": class_code, "s": sec_code, "p": 0}
+        self._logger.debug('Sending msg: %s', quotes_msg)
+        self._connector.send(quotes_msg)
         # Request level2 data
         self._logger.info('Requesting level2 data for %s\\%s', class_code, sec_code)
-        depth = 30
-        msg = '{"msgid":%s,"c":"%s","s":"%s","depth":%s}' % \
-              (MsgId.MSG_ID_CREATE_LEVEL2_DATASOURCE, class_code, sec_code, depth)
-        self._logger.debug('Sending msg: %s' % msg)
-        self._connector.websocket_app.send(msg, opcode=ABNF.OPCODE_BINARY)
+        level2_msg = {"msgid": MsgId.MSG_ID_CREATE_LEVEL2_DATASOURCE, "c": class_code, "s": sec_code,
+                      "depth": self._LEVEL2_DEPTH}
+        self._logger.debug('Sending msg: %s', level2_msg)
+        self._connector.send(level2_msg, ABNF.OPCODE_BINARY)
 
     def subscribe_feed(self, class_code, sec_code, subscriber):
         """
@@ -56,10 +58,8 @@ class WebQuikFeed:
         :param sec_code code of security, example 'RIU8'
         :param subscriber subscriber class, inherited from base feed
         """
-        key = (class_code, sec_code)
-
         # Register given feed callback
-        self._feed_subscribers[key] = subscriber
+        self._feed_subscribers[self._connector.tuple2asset((class_code, sec_code))] = subscriber
 
         # Request this feed from server
         if self._connector.status == WebQuikConnector.Status.CONNECTED:
@@ -69,8 +69,8 @@ class WebQuikFeed:
         """
         On start, trade session is opened. Now we can request data and set orders
         """
-        for (class_code, sec_code), value in self._feed_subscribers.items():
-            self._request_feed(class_code, sec_code)
+        for asset_str in self._feed_subscribers:
+            self._request_feed(*self._connector.asset2tuple(asset_str))
 
     def _on_quotes(self, data: dict):
         """
@@ -78,15 +78,15 @@ class WebQuikFeed:
         Msg sample: {"msgid":21011,"dataResult":{"CETS\u00A6BYNRUBTODTOM":{"bid":0, "ask":10, last":0,"lastchange":...
         """
         self._logger.debug('Got bid/ask: %s', data)
-        for asset_str in data['dataResult'].keys():
-            (asset_class, asset_code) = self._connector.asset2tuple(asset_str)
-            if (asset_class, asset_code) in self._feed_subscribers.keys():
-                bid = data['dataResult'][asset_str]['bid']
-                ask = data['dataResult'][asset_str]['offer']
-                last = data['dataResult'][asset_str].get('last')
+        for asset_str, quote in data['dataResult'].items():
+            subscriber = self._feed_subscribers.get(asset_str)
+            if subscriber is not None:
+                (asset_class, asset_code) = self._connector.asset2tuple(asset_str)
+                bid = quote['bid']
+                ask = quote['offer']
+                last = quote.get('last')
                 # Send to subscriber
-                self._feed_subscribers[(asset_class, asset_code)] \
-                    .on_quote(asset_class, asset_code, datetime.now(), bid, ask, last)
+                subscriber.on_quote(asset_class, asset_code, datetime.now(), bid, ask, last)
 
     def _on_candle(self, data: dict):
         """
@@ -97,22 +97,16 @@ class WebQuikFeed:
         self._logger.debug('Got feed: %s', data)
 
         # Todo: get rid of nested check
-        for asset_str in data['graph'].keys():
-            # Each asset in data['graph']
-            (asset_class, asset_code) = self._connector.asset2tuple(asset_str)
-            if self._feed_subscribers[(asset_class, asset_code)] is not None:
-                asset_data = data['graph'][asset_str]
+        for asset_str, asset_data in data['graph'].items():
+            # Each asset in data['graph'], key is class¦code¦interval
+            subscriber = self._feed_subscribers.get(asset_str.rpartition(WebQuikConnector.ASSET_DELIMITER)[0])
+            if subscriber is not None:
+                (asset_class, asset_code) = self._connector.asset2tuple(asset_str)
+                on_candle = subscriber.on_candle
                 for ohlcv in asset_data:
-                    # Each ohlcv for this asset
-                    dt = datetime.fromisoformat(ohlcv['d'])
-                    o = ohlcv['o']
-                    h = ohlcv['h']
-                    l_ = ohlcv['l']
-                    c = ohlcv['c']
-                    v = ohlcv['v']
-                    # Send data to subscribers
-                    self._feed_subscribers[(asset_class, asset_code)] \
-                        .on_candle(asset_class, asset_code, dt, o, h, l_, c, v)
+                    # Each ohlcv for this asset. Send data to subscribers
+                    on_candle(asset_class, asset_code, datetime.fromisoformat(ohlcv['d']),
+                              ohlcv['o'], ohlcv['h'], ohlcv['l'], ohlcv['c'], ohlcv['v'])
 
     def _on_level2(self, data: dict):
         """
@@ -125,25 +119,17 @@ class WebQuikFeed:
 
         # Go through all assets in level2 message
         # Todo: get rid of nested check
-        for asset_str in data['quotes']:
-            asset_class, asset_code = self._connector.asset2tuple(asset_str)
-            if self._feed_subscribers[(asset_class, asset_code)] is not None:
+        for asset_str, asset_quotes in data['quotes'].items():
+            subscriber = self._feed_subscribers.get(asset_str)
+            if subscriber is not None:
+                asset_class, asset_code = self._connector.asset2tuple(asset_str)
                 # {'22806':  {'b': 234, 's': 0, 'by': 0, 'sy': 0}, ..}
-                level2_quik: dict = data['quotes'][asset_str]['lines']
-                level2 = {}
-                for key in level2_quik.keys():
-                    price = int(key)
-                    bid = level2_quik[key]['b']
-                    if bid == 0:
-                        bid = None
-                    ask = level2_quik[key]['s']
-                    if ask == 0:
-                        ask = None
-                    level2[price] = (bid, ask)
-
-                    # If somebody subscribed to level2 of this asset, send her this data.
-                self._feed_subscribers[(asset_class, asset_code)].on_level2(asset_class, asset_code, datetime.now(),
-                                                                            level2)
+                level2_quik: dict = asset_quotes['lines']
+                # Zero volume means no bid or ask at this price
+                level2 = {int(price): (line['b'] or None, line['s'] or None) for price, line in level2_quik.items()}
+
+                # If somebody subscribed to level2 of this asset, send her this data.
+                subscriber.on_level2(asset_class, asset_code, datetime.now(), level2)
 
     def on_heartbeat(self):
         """